@@ -5,18 +5,288 @@ USB Detector - Detects and manages USB devices
 
 import subprocess
 import re
+import time
 import os
 import json
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Optional, Callable
+
+try:
+    import pyudev
+except ImportError:
+    pyudev = None
+
+SYS_BLOCK = '/sys/block'
+
+# udev keeps the properties it collected per device here, absent when udevd is not running
+UDEV_DATA = '/run/udev/data'
+
+# Kernel block devices that are never removable drives
+VIRTUAL_BLOCK_PREFIXES = ('loop', 'ram', 'zram', 'dm-', 'md', 'sr')
+
+# Octal escapes used for whitespace in /proc/mounts
+_MOUNT_ESCAPE_RE = re.compile(r'\\([0-7]{3})')
+
+# Seconds a device scan is reused, udev events invalidate it sooner
+CACHE_TTL = 3.0
+
+# Last device scan shared by every USBDetector
+_device_cache = {"ts": 0.0, "devices": None}
+
+def invalidate_device_cache():
+    """Make the next get_usb_devices call scan again"""
+    _device_cache["devices"] = None
+
+# Size unit multipliers to GB, keyed by lsblk's one-character suffix
+_SIZE_MULT = MappingProxyType({
+    'B': 1 / (1024**3),
+    'K': 1 / (1024**2),
+    'M': 1 / 1024,
+    'G': 1,
+    'T': 1024
+})
 
 class USBDetector:
     """Class for detecting USB devices"""
     
     def __init__(self):
         self.devices = []
+        self._context = pyudev.Context() if pyudev is not None else None
+        self._monitor = self._start_monitor()
         
+    def _start_monitor(self):
+        """Watch udev block events so cached device scans are dropped as soon as something changes"""
+        if self._context is None:
+            return None
+            
+        try:
+            monitor = pyudev.Monitor.from_netlink(self._context)
+            monitor.filter_by('block')
+            monitor.start()
+            return monitor
+        except Exception as e:
+            print(f"udev monitor unavailable, device scans are only refreshed after {CACHE_TTL}s: {e}")
+            return None
+            
+    def start_observer(self, callback: Callable[[], None]):
+        """Call callback from a udev thread on every block device event, returns the observer or None without udev"""
+        if self._context is None:
+            return None
+            
+        try:
+            monitor = pyudev.Monitor.from_netlink(self._context)
+            monitor.filter_by('block')
+            observer = pyudev.MonitorObserver(monitor, callback=lambda device: callback())
+            observer.start()
+            return observer
+        except Exception as e:
+            print(f"udev observer unavailable, devices are only refreshed on request: {e}")
+            return None
+    
     def get_usb_devices(self) -> List[Dict]:
         """Get list of USB storage devices"""
+        if self._monitor is not None:
+            # Any pending block event means the cached list may be stale
+            while self._monitor.poll(timeout=0) is not None:
+                invalidate_device_cache()
+                
+        cached = _device_cache["devices"]
+        if cached is not None and time.monotonic() - _device_cache["ts"] < CACHE_TTL:
+            return list(cached)
+        
+        devices = None
+        if self._context is not None and os.path.isdir(UDEV_DATA):
+            try:
+                # The udev database already has labels and filesystems, no device is opened
+                devices = self._udev_device_detection()
+            except Exception as e:
+                print(f"udev scan failed, reading {SYS_BLOCK} instead: {e}")
+                
+        if devices is None:
+            try:
+                # Reading sysfs directly avoids forking lsblk on every refresh
+                devices = self._sysfs_device_detection()
+            except OSError as e:
+                print(f"Error reading {SYS_BLOCK}: {e}")
+                devices = self._lsblk_device_detection()
+                
+            self._add_partition_details(devices)
+            
+        _device_cache["ts"] = time.monotonic()
+        _device_cache["devices"] = devices
+        
+        return list(devices)
+    
+    def _udev_device_detection(self) -> List[Dict]:
+        """Detect USB disks and their partitions from the udev database"""
+        devices = []
+        mountpoints = self._read_mountpoints()
+        
+        # libudev ORs property matches, so the device type is checked here
+        disks = self._context.list_devices(subsystem='block', ID_BUS='usb')
+        for disk in sorted(disks, key=lambda disk: disk.device_node or ''):
+            if disk.device_type != 'disk' or not disk.device_node:
+                continue
+                
+            # Optical drives are never targets, the sysfs and lsblk scans skip them too
+            properties = disk.properties
+            if properties.get('ID_CDROM') or disk.sys_name.startswith(VIRTUAL_BLOCK_PREFIXES):
+                continue
+                
+            size_bytes = self._read_sectors(disk.sys_path) * 512
+            
+            device_info = {
+                'path': disk.device_node,
+                'size': round(size_bytes / (1024**3), 2),
+                'size_str': self._format_size(size_bytes),
+                'model': properties.get('ID_MODEL', 'Unknown').replace('_', ' '),
+                'vendor': properties.get('ID_VENDOR', 'Unknown').replace('_', ' '),
+                'mountpoint': mountpoints.get(disk.device_node),
+                'partitions': [],
+                'partitions_detail': []
+            }
+            
+            partitions = self._context.list_devices(subsystem='block', parent=disk)
+            for partition in sorted(partitions, key=lambda partition: partition.device_node or ''):
+                if partition.device_type != 'partition':
+                    continue
+                    
+                partition_path = partition.device_node
+                partition_size = self._read_sectors(partition.sys_path) * 512
+                
+                device_info['partitions'].append({
+                    'path': partition_path,
+                    'size': self._format_size(partition_size),
+                    'mountpoint': mountpoints.get(partition_path)
+                })
+                device_info['partitions_detail'].append({
+                    'name': partition_path,
+                    'label': partition.properties.get('ID_FS_LABEL'),
+                    'size_bytes': partition_size,
+                    'fstype': partition.properties.get('ID_FS_TYPE')
+                })
+            
+            devices.append(device_info)
+            
+        return devices
+    
+    def _sysfs_device_detection(self) -> List[Dict]:
+        """Detect USB disks and their partitions from /sys/block"""
+        devices = []
+        mountpoints = self._read_mountpoints()
+        
+        for name in sorted(os.listdir(SYS_BLOCK)):
+            if name.startswith(VIRTUAL_BLOCK_PREFIXES):
+                continue
+            
+            sys_path = os.path.join(SYS_BLOCK, name)
+            
+            # Same check as _is_usb_device, the sysfs link points below the USB controller
+            if 'usb' not in os.path.realpath(sys_path).lower():
+                continue
+            
+            size_bytes = self._read_sectors(sys_path) * 512
+            device_path = f"/dev/{name}"
+            
+            device_info = {
+                'path': device_path,
+                'size': round(size_bytes / (1024**3), 2),
+                'size_str': self._format_size(size_bytes),
+                'model': self._read_sysfs_attr(os.path.join(sys_path, 'device', 'model')),
+                'vendor': self._read_sysfs_attr(os.path.join(sys_path, 'device', 'vendor')),
+                'mountpoint': mountpoints.get(device_path),
+                'partitions': []
+            }
+            
+            # Partitions show up as child directories named after the disk
+            for child in sorted(os.listdir(sys_path)):
+                child_path = os.path.join(sys_path, child)
+                if child.startswith(name) and os.path.exists(os.path.join(child_path, 'partition')):
+                    partition_path = f"/dev/{child}"
+                    partition_info = {
+                        'path': partition_path,
+                        'size': self._format_size(self._read_sectors(child_path) * 512),
+                        'mountpoint': mountpoints.get(partition_path)
+                    }
+                    device_info['partitions'].append(partition_info)
+            
+            devices.append(device_info)
+            
+        return devices
+    
+    def _add_partition_details(self, devices: List[Dict]):
+        """Attach labels and filesystems of all partitions using a single lsblk call"""
+        for device_info in devices:
+            device_info['partitions_detail'] = []
+            
+        if not devices:
+            return
+            
+        try:
+            result = subprocess.run([
+                'lsblk', '-J', '-p', '-b', '-o', 'NAME,LABEL,SIZE,FSTYPE',
+                *[device_info['path'] for device_info in devices]
+            ], capture_output=True, text=True, check=True)
+            
+            data = json.loads(result.stdout)
+        except (subprocess.CalledProcessError, json.JSONDecodeError, OSError) as e:
+            print(f"Error reading partition details: {e}")
+            return
+            
+        children = {device['name']: device.get('children', []) for device in data.get('blockdevices', [])}
+        
+        for device_info in devices:
+            for child in children.get(device_info['path'], []):
+                device_info['partitions_detail'].append({
+                    'name': child['name'],
+                    'label': child.get('label'),
+                    'size_bytes': int(child.get('size') or 0),
+                    'fstype': child.get('fstype')
+                })
+    
+    def _read_sectors(self, sys_path: str) -> int:
+        """Read a block device size in 512-byte sectors from sysfs"""
+        with open(os.path.join(sys_path, 'size'), 'r') as f:
+            return int(f.read().strip() or 0)
+    
+    def _read_sysfs_attr(self, attr_path: str) -> str:
+        """Read a sysfs text attribute, 'Unknown' when missing"""
+        try:
+            with open(attr_path, 'r') as f:
+                return f.read().strip() or 'Unknown'
+        except OSError:
+            return 'Unknown'
+    
+    def _read_mountpoints(self) -> Dict[str, str]:
+        """Map mounted device paths to their mount points"""
+        mountpoints = {}
+        
+        try:
+            with open('/proc/self/mounts', 'r') as f:
+                for line in f:
+                    parts = line.split(' ', 2)
+                    if len(parts) >= 2 and parts[0].startswith('/dev/'):
+                        # Mount points escape spaces and tabs as octal sequences
+                        mountpoints.setdefault(parts[0], _MOUNT_ESCAPE_RE.sub(
+                            lambda m: chr(int(m.group(1), 8)), parts[1]))
+        except OSError as e:
+            print(f"Error reading mounts: {e}")
+            
+        return mountpoints
+    
+    def _format_size(self, size_bytes: float) -> str:
+        """Format a size the way lsblk does, e.g. 14.9G"""
+        for unit in ('B', 'K', 'M', 'G', 'T'):
+            if size_bytes < 1024 or unit == 'T':
+                break
+            size_bytes /= 1024
+            
+        if unit == 'B':
+            return f"{int(size_bytes)}B"
+        return f"{size_bytes:.1f}".rstrip('0').rstrip('.') + unit
+    
+    def _lsblk_device_detection(self) -> List[Dict]:
+        """Detect USB disks with lsblk"""
         devices = []
         
         try:
@@ -68,31 +338,23 @@ class USBDetector:
         if not size_str:
             return 0.0
             
-        # Remove any whitespace
-        size_str = size_str.strip()
+        size_str = size_str.strip().upper()
         
-        # Extract number and unit
-        match = re.match(r'^(\d+(?:\.\d+)?)\s*([KMGT]?B?)', size_str, re.IGNORECASE)
-        if not match:
+        # lsblk sizes end in a single unit character (14.9G), also accept the KB/MB/... forms
+        if size_str.endswith('B') and len(size_str) > 1 and size_str[-2] in _SIZE_MULT:
+            size_str = size_str[:-1]
+        
+        try:
+            unit = size_str[-1:]
+            if unit in _SIZE_MULT:
+                size_num = float(size_str[:-1])
+                multiplier = _SIZE_MULT[unit]
+            else:
+                size_num = float(size_str)
+                multiplier = 1
+        except ValueError:
             return 0.0
-            
-        size_num = float(match.group(1))
-        unit = match.group(2).upper()
-        
-        # Convert to GB
-        multipliers = {
-            'B': 1 / (1024**3),
-            'KB': 1 / (1024**2),
-            'MB': 1 / 1024,
-            'GB': 1,
-            'TB': 1024,
-            'K': 1 / (1024**2),
-            'M': 1 / 1024,
-            'G': 1,
-            'T': 1024
-        }
-        
-        multiplier = multipliers.get(unit, 1)
+        
         return round(size_num * multiplier, 2)
     
     def _fallback_device_detection(self) -> List[Dict]:
@@ -102,7 +364,7 @@ class USBDetector:
         try:
             # Try using /proc/partitions and /sys/block
             with open('/proc/partitions', 'r') as f:
-                lines = f.readlines()
+                lines = f.read().splitlines()
                 
             for line in lines[2:]:  # Skip header
                 parts = line.strip().split()
@@ -161,11 +423,7 @@ class USBDetector:
     
     def is_device_mounted(self, device_path: str) -> bool:
         """Check if device or any of its partitions are mounted"""
-        try:
-            result = subprocess.run(['mount'], capture_output=True, text=True, check=True)
-            return device_path in result.stdout
-        except:
-            return False
+        return any(source.startswith(device_path) for source in self._read_mountpoints())
     
     def get_device_partitions(self, device_path: str) -> List[str]:
         """Get list of partitions for a device"""
@@ -175,7 +433,7 @@ class USBDetector:
         try:
             # Look for partitions in /proc/partitions
             with open('/proc/partitions', 'r') as f:
-                lines = f.readlines()
+                lines = f.read().splitlines()
                 
             for line in lines[2:]:  # Skip header
                 parts = line.strip().split()
@@ -196,16 +454,30 @@ class USBDetector:
         # Get all partitions
         partitions = self.get_device_partitions(device_path)
         
-        # Also try the main device
-        all_paths = [device_path] + partitions
+        # Also try the main device, but only paths that are actually mounted
+        mountpoints = self._read_mountpoints()
+        all_paths = [path for path in [device_path] + partitions if path in mountpoints]
+        if not all_paths:
+            return success
+        
+        # One umount call for everything instead of one per path
+        try:
+            subprocess.run(['umount', *all_paths], check=True, 
+                          capture_output=True, text=True)
+            for path in all_paths:
+                print(f"Unmounted {path}")
+            return success
+        except (subprocess.CalledProcessError, OSError):
+            pass
         
+        # Retry one by one to find out which path failed
         for path in all_paths:
             try:
                 subprocess.run(['umount', path], check=True, 
                               capture_output=True, text=True)
                 print(f"Unmounted {path}")
             except subprocess.CalledProcessError:
-                # It's okay if umount fails - device might not be mounted
+                # It's okay if umount fails - the batch call may have unmounted it already
                 pass
             except Exception as e:
                 print(f"Error unmounting {path}: {e}")
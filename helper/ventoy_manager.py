@@ -3,15 +3,160 @@
 Ventoy Manager - Handles Ventoy download, installation and management
 """
 
+import errno
+import hashlib
+import io
+import json
+import mmap
 import os
+import pty
+import re
+import selectors
+import socket
 import subprocess
 import tempfile
 import shutil
 import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 import tarfile
-from typing import Optional, Callable
-from PySide6.QtCore import QObject, Signal, QThread
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Callable, Tuple
+from PySide6.QtCore import QObject, QProcess, Signal, QThread
+
+try:
+    import pyudev
+except ImportError:
+    pyudev = None
+
+# Seconds a has_ventoy answer is reused, partitions only change on hotplug or install
+CACHE_TTL = 3.0
+
+# Device path to (sysfs stamp, time checked, has Ventoy), shared by every VentoyManager
+_ventoy_cache: Dict[str, Tuple[Optional[int], float, bool]] = {}
+
+def _device_stamp(device_path: str) -> Optional[int]:
+    """mtime of the disk's sysfs size attribute, it changes whenever the disk is plugged in again"""
+    try:
+        return os.stat(f"/sys/class/block/{os.path.basename(device_path)}/size").st_mtime_ns
+    except OSError:
+        return None
+
+def invalidate_ventoy_cache(device_path: Optional[str] = None):
+    """Forget cached has_ventoy answers for one device or for all of them"""
+    if device_path is None:
+        _ventoy_cache.clear()
+    else:
+        _ventoy_cache.pop(device_path, None)
+
+# udev's symlinks named after filesystem labels, reading them does not touch the devices
+DISK_BY_LABEL = '/dev/disk/by-label'
+
+# Escapes udev uses for unsafe characters in by-label link names
+_LABEL_ESCAPE_RE = re.compile(r'\\x([0-9a-fA-F]{2})')
+
+# Terminal colour and cursor sequences the installer may print now that it writes to a pty
+_ANSI_ESCAPE_RE = re.compile(rb'\x1b\[[0-9;?]*[A-Za-z]')
+
+class DownloadCancelled(Exception):
+    """Raised from a download's progress report once its cancel event is set"""
+
+class _ProgressReader(io.RawIOBase):
+    """Read-only stream that reports and hashes the bytes read through it"""
+    
+    def __init__(self, raw, callback: Callable):
+        super().__init__()
+        self._raw = raw
+        self._callback = callback
+        self.bytes_read = 0
+        self.sha256 = hashlib.sha256()
+        
+    def readable(self) -> bool:
+        return True
+        
+    def readinto(self, buffer) -> int:
+        data = self._raw.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.sha256.update(data)
+        self.bytes_read += n
+        self._callback(self.bytes_read)
+        return n
+
+class _CallbackSink:
+    """Download progress sink forwarding percentages to a callback"""
+    
+    def __init__(self, callback: Optional[Callable]):
+        self.callback = callback
+        
+    def set_progress(self, progress: int):
+        if self.callback:
+            self.callback(progress)
+            
+    def log(self, message: str):
+        pass
+
+class _WidgetSink:
+    """Download progress sink driving a progress widget"""
+    
+    def __init__(self, progress_widget):
+        self.progress_widget = progress_widget
+        
+    def set_progress(self, progress: int):
+        if self.progress_widget:
+            self.progress_widget.set_progress(progress)
+            
+    def log(self, message: str):
+        if self.progress_widget:
+            self.progress_widget.add_log(message)
+
+class _DownloadAdapter(HTTPAdapter):
+    """HTTP adapter that can enlarge the socket receive buffer through VENTOY_SO_RCVBUF"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        # A fixed SO_RCVBUF turns off the kernel's tcp_rmem autotuning for the socket,
+        # which is usually the better choice, so only set it when explicitly asked to
+        # (e.g. VENTOY_SO_RCVBUF=8388608 on high latency or VPN links)
+        rcvbuf = os.environ.get('VENTOY_SO_RCVBUF')
+        if rcvbuf and rcvbuf.isdigit():
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_RCVBUF, int(rcvbuf))
+            ]
+        super().init_poolmanager(*args, **kwargs)
+
+class LsblkProbe(QObject):
+    """Run lsblk for a device through QProcess so the GUI thread never waits for it"""
+    
+    finished = Signal(dict)
+    
+    def __init__(self, device_path: str, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.device_path = device_path
+        self._process = QProcess(self)
+        self._process.finished.connect(self._on_finished)
+        self._process.errorOccurred.connect(self._on_error)
+        
+    def start(self):
+        """Start lsblk, finished is emitted with its parsed JSON output"""
+        self._process.start('lsblk', ['-J', '-p', '-o', 'NAME,SIZE,LABEL,TYPE', self.device_path])
+        
+    def _on_finished(self, exit_code: int, exit_status):
+        data = {}
+        if exit_code == 0:
+            try:
+                data = json.loads(bytes(self._process.readAllStandardOutput()).decode())
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                print(f"Error parsing lsblk output: {e}")
+        self.finished.emit(data)
+        
+    def _on_error(self, error):
+        # finished is never emitted when the process could not be started
+        if error == QProcess.ProcessError.FailedToStart:
+            print(f"Could not run lsblk: {self._process.errorString()}")
+            self.finished.emit({})
 
 class VentoyInstaller(QThread):
     """Thread for installing Ventoy"""
@@ -21,11 +166,16 @@ class VentoyInstaller(QThread):
     log_updated = Signal(str)
     finished_signal = Signal(bool, str)
     
-    def __init__(self, device_path: str, progress_widget):
+    def __init__(self, device_path: str, progress_widget, ventoy_manager: Optional['VentoyManager'] = None):
         super().__init__()
         self.device_path = device_path
         self.progress_widget = progress_widget
-        self.ventoy_manager = VentoyManager()
+        self.ventoy_manager = ventoy_manager or VentoyManager()
+        self._cancel = threading.Event()
+        
+    def cancel(self):
+        """Ask the installer to stop before it starts writing to the device, a running install is left to finish"""
+        self._cancel.set()
         
     def run(self):
         """Run the Ventoy installation"""
@@ -33,13 +183,21 @@ class VentoyInstaller(QThread):
             # Download Ventoy
             self.status_updated.emit("Downloading Ventoy...")
             self.log_updated.emit("Starting Ventoy download...")
+            self.log_updated.emit(f"Downloading from: {self.ventoy_manager.VENTOY_URL}")
+            
+            ventoy_dir = self.ventoy_manager.download_ventoy(self.update_progress, self._cancel)
             
-            ventoy_dir = self.ventoy_manager.download_ventoy(self.update_progress)
+            # Stopping halfway through partitioning would leave the device unusable, so this is the last exit
+            if self._cancel.is_set():
+                self.finished_signal.emit(False, "Installation cancelled")
+                return
+                
             if not ventoy_dir:
                 self.finished_signal.emit(False, "Failed to download Ventoy")
                 return
                 
             # Install Ventoy
+            self.progress_updated.emit(70)
             self.status_updated.emit("Installing Ventoy...")
             self.log_updated.emit("Starting Ventoy installation...")
             
@@ -63,150 +221,265 @@ class VentoyManager:
     
     VENTOY_VERSION = "1.1.05"
     VENTOY_URL = "https://github.com/ventoy/Ventoy/releases/download/v1.1.05/ventoy-1.1.05-linux.tar.gz"
+    VENTOY_SHA256 = "3379c99890359dcff55aab7f7b3286f87c988d1da2fd616e6a9e305fb0a1de9e"
+    
+    # Extracted releases are kept here so each version is only downloaded once
+    CACHE_DIR = os.path.expanduser("~/.cache/ventoy-image-writer")
+    
+    # Bytes read from the HTTP response per iteration
+    DOWNLOAD_CHUNK_SIZE = 1 << 20
+    
+    # Parallel range requests used to fetch the archive
+    DOWNLOAD_CONNECTIONS = 4
+    
+    # Connect and read timeouts in seconds, a stalled connection fails instead of blocking forever
+    DOWNLOAD_TIMEOUT = (10, 30)
     
     def __init__(self):
         self.ventoy_dir = None
         
-    def download_ventoy(self, progress_callback: Optional[Callable] = None) -> Optional[str]:
-        """Download and extract Ventoy"""
+        # One session for the probe and all range requests so connections are reused
+        self._session = requests.Session()
+        adapter = _DownloadAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+    def download_ventoy(self, progress_callback: Optional[Callable] = None,
+                        cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """Download and extract Ventoy, setting cancel_event aborts at the next chunk"""
+        return self._download(_CallbackSink(progress_callback), cancel_event)
+    
+    def download_ventoy_simple(self, progress_widget=None) -> Optional[str]:
+        """Download and extract Ventoy (simplified version with progress)"""
+        return self._download(_WidgetSink(progress_widget))
+    
+    def _download(self, sink, cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """Download and extract Ventoy, reporting through a sink with set_progress(int) and log(str)"""
         try:
-            # Create temp directory
-            temp_dir = tempfile.mkdtemp(prefix="ventoy_")
-            
-            # Download file
-            response = requests.get(self.VENTOY_URL, stream=True)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            tar_path = os.path.join(temp_dir, "ventoy.tar.gz")
-            
-            with open(tar_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if progress_callback and total_size > 0:
-                            progress = int((downloaded / total_size) * 50)  # 50% for download
-                            progress_callback(progress)
+            if self._cached_ventoy_dir():
+                sink.log(f"Using cached Ventoy {self.VENTOY_VERSION}")
+            else:
+                sink.log(f"Downloading from: {self.VENTOY_URL}")
+            sink.set_progress(5)
             
-            # Extract archive
-            if progress_callback:
-                progress_callback(60)
-                
-            with tarfile.open(tar_path, 'r:gz') as tar:
-                tar.extractall(temp_dir)
+            last_progress = -1
+            logged = False
             
-            # Find ventoy directory
-            ventoy_dir = None
-            for item in os.listdir(temp_dir):
-                item_path = os.path.join(temp_dir, item)
-                if os.path.isdir(item_path) and item.startswith('ventoy-'):
-                    ventoy_dir = item_path
-                    break
+            def report(downloaded, total_size):
+                nonlocal last_progress, logged
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelled(f"cancelled after {downloaded} bytes")
+                    
+                if not logged:
+                    # Without a Content-Length the size stays unknown, log the start only once either way
+                    logged = True
+                    if total_size > 0:
+                        sink.log(f"Downloading {total_size / (1024*1024):.1f} MB...")
+                    else:
+                        sink.log("Downloading (size unknown)...")
+                    
+                if total_size > 0:
+                    progress = int((downloaded / total_size) * 55) + 5  # 5-60% for download and extraction
+                    if progress != last_progress:
+                        last_progress = progress
+                        sink.set_progress(progress)
             
-            if not ventoy_dir:
-                raise Exception("Ventoy directory not found in archive")
+            ventoy_dir = self._fetch_ventoy(report)
             
-            if progress_callback:
-                progress_callback(70)
+            sink.set_progress(65)
+            sink.log(f"Ventoy available at: {ventoy_dir}")
                 
             self.ventoy_dir = ventoy_dir
             return ventoy_dir
             
         except Exception as e:
             print(f"Error downloading Ventoy: {e}")
+            sink.log(f"Download error: {e}")
             return None
     
-    def download_ventoy_simple(self, progress_widget=None) -> Optional[str]:
-        """Download and extract Ventoy (simplified version with progress)"""
-        try:
-            from PySide6.QtWidgets import QApplication
-            
-            # Create temp directory
-            temp_dir = tempfile.mkdtemp(prefix="ventoy_")
-            
-            if progress_widget:
-                progress_widget.add_log(f"Downloading from: {self.VENTOY_URL}")
-                progress_widget.set_progress(5)
+    def _cached_ventoy_dir(self) -> Optional[str]:
+        """Path of the cached Ventoy release if it is complete"""
+        cached = os.path.join(self.CACHE_DIR, f"ventoy-{self.VENTOY_VERSION}")
+        if os.path.isfile(os.path.join(cached, "Ventoy2Disk.sh")):
+            return cached
+        return None
+    
+    def _fetch_ventoy(self, report: Callable) -> str:
+        """Return the cached Ventoy directory, downloading and verifying the release first if needed"""
+        cached = self._cached_ventoy_dir()
+        if cached:
+            return cached
+            
+        cached = os.path.join(self.CACHE_DIR, f"ventoy-{self.VENTOY_VERSION}")
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        
+        # Extract next to the cache so the finished directory can be renamed into place
+        with tempfile.TemporaryDirectory(prefix="ventoy_", dir=self.CACHE_DIR) as temp_dir:
+            digest, top_dir = self._download_archive(temp_dir, report)
+            if digest != self.VENTOY_SHA256:
+                raise Exception(f"Checksum mismatch for Ventoy archive (got {digest})")
+                
+            if not top_dir:
+                raise Exception("Ventoy directory not found in archive")
+            ventoy_dir = os.path.join(temp_dir, top_dir)
+                
+            # Replace an incomplete copy left behind by an earlier run
+            if os.path.isdir(cached):
+                shutil.rmtree(cached)
+            os.rename(ventoy_dir, cached)
             
-            # Download file with progress
-            response = requests.get(self.VENTOY_URL, stream=True)
+        return cached
+    
+    def _download_archive(self, temp_dir: str, report: Callable) -> Tuple[str, Optional[str]]:
+        """Download the Ventoy archive into temp_dir, return its SHA-256 and ventoy-* directory, report(downloaded, total)"""
+        tar_path = self._download_ranges(temp_dir, report)
+        
+        if tar_path is None:
+            # No range support, extract straight from the response so the archive never touches the disk
+            response = self._session.get(self.VENTOY_URL, stream=True, timeout=self.DOWNLOAD_TIMEOUT)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
+            response.raw.decode_content = True
+            return self._extract_stream(response.raw, temp_dir, lambda downloaded: report(downloaded, total_size))
             
-            tar_path = os.path.join(temp_dir, "ventoy.tar.gz")
+        try:
+            # Read the assembled archive from the page cache without another buffered copy
+            with open(tar_path, 'rb') as f:
+                archive = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+            try:
+                # Hash while extracting instead of making a separate pass over the archive
+                return self._extract_stream(archive, temp_dir, lambda downloaded: None)
+            finally:
+                archive.close()
+        finally:
+            os.remove(tar_path)
+    
+    def _extract_stream(self, raw, temp_dir: str, callback: Callable) -> Tuple[str, Optional[str]]:
+        """Extract a gzipped tar read sequentially from raw, return its SHA-256 and ventoy-* directory"""
+        reader = _ProgressReader(raw, callback)
+        # Larger blocks for both reading the stream and copying member data out of it
+        with tarfile.open(fileobj=reader, mode='r|gz', bufsize=self.DOWNLOAD_CHUNK_SIZE,
+                          copybufsize=self.DOWNLOAD_CHUNK_SIZE) as tar:
+            top_dir = self._extract(tar, temp_dir)
+            
+        # tarfile stops at the end-of-archive marker, the padding still counts for the checksum
+        while reader.read(self.DOWNLOAD_CHUNK_SIZE):
+            pass
+        return reader.sha256.hexdigest(), top_dir
+    
+    def _extract(self, tar: tarfile.TarFile, temp_dir: str) -> Optional[str]:
+        """Extract tar into temp_dir and return the first top-level ventoy-* directory it contains"""
+        top_dir = None
+        
+        def members():
+            # Works in streaming mode too, where getmembers() would need a second pass
+            nonlocal top_dir
+            for member in tar:
+                if top_dir is None:
+                    name = os.path.normpath(member.name).split(os.sep, 1)[0]
+                    if name.startswith('ventoy-'):
+                        top_dir = name
+                yield member
+                
+        if hasattr(tarfile, 'data_filter'):
+            # Plain files and directories are all a release archive needs
+            tar.extractall(temp_dir, members=members(), filter='data')
+        else:
+            tar.extractall(temp_dir, members=members())
+        return top_dir
+    
+    def _download_ranges(self, temp_dir: str, report: Callable) -> Optional[str]:
+        """Fetch the archive over parallel range requests, None when the server does not support them"""
+        with self._session.get(self.VENTOY_URL, headers={'Range': 'bytes=0-0'}, stream=True,
+                               timeout=self.DOWNLOAD_TIMEOUT) as probe:
+            probe.raise_for_status()
+            content_range = probe.headers.get('content-range', '')
+            if probe.status_code != 206 or '/' not in content_range:
+                return None
+            # Reuse the final URL so the workers skip the release redirect
+            url = probe.url
             
-            if progress_widget:
-                progress_widget.add_log(f"Downloading {total_size / (1024*1024):.1f} MB...")
+        try:
+            total_size = int(content_range.rsplit('/', 1)[1])
+        except ValueError:
+            return None
+        if total_size <= 0:
+            return None
             
-            with open(tar_path, 'wb') as f:
-                chunk_count = 0
-                for chunk in response.iter_content(chunk_size=8192):
+        part_size = -(-total_size // self.DOWNLOAD_CONNECTIONS)
+        ranges = [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+        
+        downloaded = 0
+        lock = threading.Lock()
+        stop = threading.Event()
+        
+        tar_path = os.path.join(temp_dir, "ventoy.tar.gz")
+        fd = os.open(tar_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o600)
+        
+        def fetch(start, end):
+            nonlocal downloaded
+            with self._session.get(url, headers={'Range': f'bytes={start}-{end}'}, stream=True,
+                                   timeout=self.DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise Exception(f"Range request returned HTTP {response.status_code}")
+                    
+                offset = start
+                for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                    if stop.is_set():
+                        raise DownloadCancelled(f"range {start}-{end} stopped")
                     if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        chunk_count += 1
-                        
-                        # Update progress and process events every 100 chunks (about every 800KB)
-                        if chunk_count % 100 == 0:
-                            if progress_widget and total_size > 0:
-                                progress = int((downloaded / total_size) * 50) + 5  # 5-55% for download
-                                progress_widget.set_progress(progress)
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        with lock:
+                            downloaded += len(chunk)
                             
-                            # Process UI events to keep interface responsive
-                            QApplication.processEvents()
-            
-            if progress_widget:
-                progress_widget.set_progress(60)
-                progress_widget.add_log("Download completed, extracting archive...")
-            
-            # Process events before extraction
-            QApplication.processEvents()
-            
-            # Extract archive
-            with tarfile.open(tar_path, 'r:gz') as tar:
-                tar.extractall(temp_dir)
-            
-            if progress_widget:
-                progress_widget.set_progress(65)
-                progress_widget.add_log("Archive extracted successfully")
-            
-            # Process events after extraction
-            QApplication.processEvents()
-            
-            # Find ventoy directory
-            ventoy_dir = None
-            for item in os.listdir(temp_dir):
-                item_path = os.path.join(temp_dir, item)
-                if os.path.isdir(item_path) and item.startswith('ventoy-'):
-                    ventoy_dir = item_path
-                    break
-            
-            if not ventoy_dir:
-                raise Exception("Ventoy directory not found in archive")
-            
-            if progress_widget:
-                progress_widget.add_log(f"Ventoy extracted to: {ventoy_dir}")
+            if offset != end + 1:
+                raise Exception(f"Incomplete range {start}-{end}")
+        
+        try:
+            # Reserve the whole archive up front, contiguous extents and no ENOSPC halfway through
+            try:
+                os.posix_fallocate(fd, 0, total_size)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise
+                os.ftruncate(fd, total_size)
+            
+            with ThreadPoolExecutor(max_workers=self.DOWNLOAD_CONNECTIONS) as executor:
+                futures = [executor.submit(fetch, start, end) for start, end in ranges]
                 
-            self.ventoy_dir = ventoy_dir
-            return ventoy_dir
-            
-        except Exception as e:
-            print(f"Error downloading Ventoy: {e}")
-            if progress_widget:
-                progress_widget.add_log(f"Download error: {e}")
-            return None
+                # Report from the calling thread, the workers only count bytes
+                try:
+                    pending = futures
+                    while pending:
+                        pending = wait(pending, timeout=0.1).not_done
+                        report(downloaded, total_size)
+                except BaseException:
+                    # Have the workers stop at their next chunk instead of finishing the download
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+                    
+                for future in futures:
+                    future.result()
+        except BaseException:
+            os.close(fd)
+            os.remove(tar_path)
+            raise
+            
+        os.close(fd)
+        return tar_path
     
     def install_ventoy_sync(self, ventoy_dir: str, device_path: str, log_callback: Optional[Callable] = None) -> bool:
         """Install Ventoy synchronously with improved pkexec handling"""
         try:
-            from PySide6.QtWidgets import QApplication
-            
             # Find Ventoy2Disk.sh script
             script_path = os.path.join(ventoy_dir, "Ventoy2Disk.sh")
             if not os.path.exists(script_path):
@@ -221,76 +494,49 @@ class VentoyManager:
                 log_callback("Requesting administrator privileges...")
                 log_callback("Please enter your password in the authentication dialog.")
             
-            # Process events before running pkexec
-            QApplication.processEvents()
-            
             # Prepare the auto-confirmation input
-            auto_confirm = "y\ny\n"  # Two "y" responses for Ventoy prompts
+            auto_confirm = b"y\ny\n"  # Two "y" responses for Ventoy prompts
             
-            # Run Ventoy installation with pkexec and auto-confirmation
+            # Run Ventoy installation with pkexec, the answers go straight to the script's stdin
             cmd = [
                 "pkexec", 
                 "--disable-internal-agent",  # Use system auth agent
                 "env", "DISPLAY=" + os.environ.get('DISPLAY', ':0'),
-                "bash", "-c",
-                f"echo -e '{auto_confirm}' | bash {script_path} -i {device_path}"
+                "bash", script_path, "-i", device_path
             ]
             
             if log_callback:
                 log_callback(f"Running: pkexec bash {script_path} -i {device_path} (with auto-confirmation)")
                 log_callback("Automatically confirming installation prompts...")
             
-            # Process events before starting subprocess
-            QApplication.processEvents()
-            
-            # Run the command with improved error handling
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0,  # Unbuffered for real-time output
-                universal_newlines=True,
-                env=dict(os.environ, DISPLAY=os.environ.get('DISPLAY', ':0'))
-            )
-            
-            # Read output in real-time with UI updates
-            output_lines = []
-            while True:
-                # Check if process is still running
-                if process.poll() is not None:
-                    break
-                
-                # Read available output
-                try:
-                    line = process.stdout.readline()
-                    if line:
-                        line = line.rstrip()
-                        output_lines.append(line)
-                        if log_callback:
-                            log_callback(line)
-                    
-                    # Process UI events to keep interface responsive
-                    QApplication.processEvents()
-                    
-                except Exception as e:
-                    if log_callback:
-                        log_callback(f"Output read error: {e}")
-                    break
-            
-            # Get any remaining output
-            remaining_output, error_output = process.communicate()
-            if remaining_output:
-                for line in remaining_output.split('\n'):
-                    if line.strip():
-                        if log_callback:
-                            log_callback(line.strip())
-            
-            if error_output:
-                for line in error_output.split('\n'):
-                    if line.strip():
-                        if log_callback:
-                            log_callback(f"Error: {line.strip()}")
+            # A pseudo-terminal keeps the script's output line buffered so log lines arrive live
+            master_fd, slave_fd = pty.openpty()
+            try:
+                process = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=slave_fd,
+                    stderr=slave_fd,
+                    env=dict(os.environ, DISPLAY=os.environ.get('DISPLAY', ':0'))
+                )
+            except OSError:
+                os.close(master_fd)
+                raise
+            finally:
+                os.close(slave_fd)
+            
+            try:
+                process.stdin.write(auto_confirm)
+                process.stdin.close()
+            except BrokenPipeError:
+                # pkexec exited before reading, the return code tells why
+                pass
+            
+            try:
+                self._pump_output(master_fd, log_callback)
+            finally:
+                os.close(master_fd)
+            process.wait()
             
             # Check return code
             if process.returncode == 0:
@@ -315,91 +561,186 @@ class VentoyManager:
                 log_callback(f"Error installing Ventoy: {e}")
             return False
     
-    def install_ventoy(self, device_path: str, progress_widget) -> None:
-        """Install Ventoy on device (simplified version with responsive UI)"""
-        try:
-            progress_widget.set_status("Downloading Ventoy...")
-            progress_widget.add_log("Starting Ventoy download...")
-            
-            # Download Ventoy with progress updates and UI responsiveness
-            ventoy_dir = self.download_ventoy_simple(progress_widget)
-            if not ventoy_dir:
-                progress_widget.finish_operation(False, "Failed to download Ventoy")
-                return
+    def _pump_output(self, fd: int, log_callback: Optional[Callable] = None):
+        """Forward output lines read from a pty master until the other side is closed"""
+        pending = b""
+        os.set_blocking(fd, False)
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
             
-            progress_widget.set_progress(70)
-            progress_widget.set_status("Installing Ventoy...")
-            progress_widget.add_log("Starting Ventoy installation...")
+            while True:
+                selector.select()
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                except OSError as e:
+                    # Linux reports EIO instead of EOF once every writer of the pty is gone
+                    if e.errno != errno.EIO:
+                        raise
+                    data = b""
+                    
+                if not data:
+                    # EOF, flush a last line without a newline
+                    lines = [pending]
+                else:
+                    *lines, pending = (pending + data).split(b'\n')
+                    
+                for line in lines:
+                    line = _ANSI_ESCAPE_RE.sub(b'', line).decode(errors='replace').strip()
+                    if line and log_callback:
+                        log_callback(line)
+                        
+                if not data:
+                    return
+    
+    def install_ventoy(self, device_path: str, progress_widget) -> VentoyInstaller:
+        """Install Ventoy on device in a worker thread, the caller keeps the returned thread alive"""
+        installer = VentoyInstaller(device_path, progress_widget, self)
+        installer.progress_updated.connect(progress_widget.set_progress)
+        installer.status_updated.connect(progress_widget.set_status)
+        installer.log_updated.connect(progress_widget.add_log)
+        installer.finished_signal.connect(progress_widget.finish_operation)
+        
+        installer.start()
+        return installer
+    
+    def probe_ventoy(self, device_path: str, callback: Callable, parent: Optional[QObject] = None) -> Optional[LsblkProbe]:
+        """Check asynchronously if device has Ventoy installed, callback(bool) runs on the caller's thread"""
+        # Cached and udev answers are immediate, only fall back to lsblk when there is none
+        has_ventoy = self._cached_has_ventoy(device_path)
+        if has_ventoy is None:
+            has_ventoy = self._udev_has_ventoy(device_path)
+        if has_ventoy is None:
+            has_ventoy = self._label_has_ventoy(device_path)
+        if has_ventoy is not None:
+            _ventoy_cache[device_path] = (_device_stamp(device_path), time.monotonic(), has_ventoy)
+            callback(has_ventoy)
+            return None
             
-            # Install Ventoy
-            success = self.install_ventoy_sync(ventoy_dir, device_path, progress_widget.add_log)
+        def on_finished(data):
+            has_ventoy = self._has_ventoy_label(self._partitions(data))
+            if data:
+                _ventoy_cache[device_path] = (_device_stamp(device_path), time.monotonic(), has_ventoy)
+            callback(has_ventoy)
+            
+        probe = LsblkProbe(device_path, parent)
+        probe.finished.connect(on_finished)
+        probe.finished.connect(probe.deleteLater)
+        probe.start()
+        return probe
+    
+    def _lsblk(self, device_path: str) -> dict:
+        """Run lsblk once for device_path and return its parsed JSON tree, synchronous counterpart of LsblkProbe"""
+        result = subprocess.run([
+            'lsblk', '-J', '-p', '-o', 'NAME,SIZE,LABEL,TYPE', device_path
+        ], capture_output=True, text=True, check=True)
+        
+        return json.loads(result.stdout)
+    
+    def _partitions(self, data: dict) -> List[dict]:
+        """List the partitions found in an lsblk JSON tree"""
+        return [
+            child
+            for device in data.get('blockdevices', [])
+            for child in device.get('children', [])
+            if child.get('type') == 'part'
+        ]
+    
+    def _has_ventoy_label(self, partitions: List[dict]) -> bool:
+        """Check if any partition carries a Ventoy label"""
+        for partition in partitions:
+            label = partition.get('label') or ''
+            if 'ventoy' in label.lower() or 'VTOYEFI' in label:
+                return True
+        return False
+    
+    def _label_has_ventoy(self, device_path: str) -> Optional[bool]:
+        """True when a Ventoy link under /dev/disk/by-label points into device_path, None when that does not tell"""
+        try:
+            links = os.listdir(DISK_BY_LABEL)
+        except OSError:
+            return None
             
-            if success:
-                progress_widget.set_progress(100)
-                progress_widget.finish_operation(True, "Ventoy installed successfully")
-            else:
-                progress_widget.finish_operation(False, "Ventoy installation failed")
+        disk = os.path.basename(device_path)
+        partitions = []
+        for link in links:
+            partition = os.path.basename(os.path.realpath(os.path.join(DISK_BY_LABEL, link)))
+            # Partitions show up as subdirectories of their disk in sysfs
+            if os.path.exists(f"/sys/class/block/{disk}/{partition}"):
+                label = _LABEL_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), link)
+                partitions.append({'label': label})
                 
+        # udev keeps one link per label, with two Ventoy sticks only one of them owns it
+        return True if self._has_ventoy_label(partitions) else None
+    
+    def _udev_has_ventoy(self, device_path: str) -> Optional[bool]:
+        """Check partition labels in the udev database, None when udev has no filesystem data"""
+        if pyudev is None:
+            return None
+            
+        try:
+            context = pyudev.Context()
+            device = pyudev.Devices.from_device_file(context, device_path)
+            partitions = [
+                {'label': partition.properties.get('ID_FS_LABEL')}
+                for partition in context.list_devices(subsystem='block', parent=device)
+                if partition.device_type == 'partition' and partition.properties.get('ID_FS_TYPE')
+            ]
         except Exception as e:
-            progress_widget.finish_operation(False, f"Error during installation: {str(e)}")
+            print(f"udev lookup failed for {device_path}: {e}")
+            return None
+            
+        # Without probed filesystems udev cannot tell, lsblk has to look
+        if not partitions:
+            return None
+        return self._has_ventoy_label(partitions)
+    
+    def _cached_has_ventoy(self, device_path: str) -> Optional[bool]:
+        """Recent has_ventoy answer for device_path, None when there is none or the disk was replugged"""
+        cached = _ventoy_cache.get(device_path)
+        if cached and cached[0] == _device_stamp(device_path) and time.monotonic() - cached[1] < CACHE_TTL:
+            return cached[2]
+        return None
+    
+    def invalidate_cache(self, device_path: Optional[str] = None):
+        """Forget cached has_ventoy answers, call after partitioning a device"""
+        invalidate_ventoy_cache(device_path)
     
     def has_ventoy(self, device_path: str) -> bool:
         """Check if device has Ventoy installed"""
-        try:
-            # Use lsblk to check partitions
-            result = subprocess.run([
-                'lsblk', '-n', '-o', 'LABEL', device_path
-            ], capture_output=True, text=True, check=True)
-            
-            # Check if any partition has Ventoy label
-            for line in result.stdout.split('\n'):
-                label = line.strip()
-                if label and ('ventoy' in label.lower() or 'VTOYEFI' in label):
-                    return True
-            
-            return False
-            
-        except subprocess.CalledProcessError:
-            return False
+        has_ventoy = self._cached_has_ventoy(device_path)
+        if has_ventoy is not None:
+            return has_ventoy
+            
+        has_ventoy = self._udev_has_ventoy(device_path)
+        if has_ventoy is None:
+            has_ventoy = self._label_has_ventoy(device_path)
+        if has_ventoy is None:
+            try:
+                has_ventoy = self._has_ventoy_label(self._partitions(self._lsblk(device_path)))
+            except (subprocess.CalledProcessError, json.JSONDecodeError):
+                return False
+                
+        _ventoy_cache[device_path] = (_device_stamp(device_path), time.monotonic(), has_ventoy)
+        return has_ventoy
     
     def get_ventoy_partition(self, device_path: str) -> Optional[str]:
         """Get the main Ventoy partition path"""
         try:
-            # Use lsblk to get partitions with labels
-            result = subprocess.run([
-                'lsblk', '-n', '-o', 'NAME,LABEL', device_path
-            ], capture_output=True, text=True, check=True)
-            
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    parts = line.strip().split()
-                    if len(parts) >= 2:
-                        name = parts[0]
-                        label = parts[1] if len(parts) > 1 else ""
-                        
-                        # Strip tree formatting characters (├─, └─, etc.)
-                        clean_name = name.lstrip('├─└─│ ')
-                        
-                        # Look for the main Ventoy partition (usually the larger one)
-                        if label and 'ventoy' in label.lower() and 'efi' not in label.lower():
-                            return f"/dev/{clean_name}"
+            for partition in self._partitions(self._lsblk(device_path)):
+                label = (partition.get('label') or '').lower()
+                
+                # Look for the main Ventoy partition (usually the larger one)
+                if 'ventoy' in label and 'efi' not in label:
+                    return partition['name']
             
             return None
             
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, json.JSONDecodeError):
             return None
     
-    def cleanup(self):
-        """Clean up temporary files"""
-        if self.ventoy_dir and os.path.exists(self.ventoy_dir):
-            try:
-                # Remove the parent temp directory
-                temp_parent = os.path.dirname(self.ventoy_dir)
-                if temp_parent.startswith('/tmp/'):
-                    shutil.rmtree(temp_parent)
-            except Exception as e:
-                print(f"Error cleaning up: {e}")
-    
     def get_ventoy_info(self, device_path: str) -> dict:
         """Get Ventoy information from device"""
         info = {
@@ -409,27 +750,19 @@ class VentoyManager:
         }
         
         try:
-            if self.has_ventoy(device_path):
+            partitions = self._partitions(self._lsblk(device_path))
+            
+            if self._has_ventoy_label(partitions):
                 info['installed'] = True
                 
-                # Get partition information
-                result = subprocess.run([
-                    'lsblk', '-n', '-o', 'NAME,SIZE,LABEL,TYPE', device_path
-                ], capture_output=True, text=True, check=True)
-                
-                for line in result.stdout.split('\n'):
-                    if line.strip():
-                        parts = line.strip().split()
-                        if len(parts) >= 3 and parts[3] == 'part':
-                            # Strip tree formatting characters (├─, └─, etc.)
-                            clean_name = parts[0].lstrip('├─└─│ ')
-                            partition_info = {
-                                'name': clean_name,
-                                'size': parts[1],
-                                'label': parts[2] if len(parts) > 2 else '',
-                                'path': f"/dev/{clean_name}"
-                            }
-                            info['partitions'].append(partition_info)
+                for partition in partitions:
+                    partition_info = {
+                        'name': os.path.basename(partition['name']),
+                        'size': partition.get('size'),
+                        'label': partition.get('label') or '',
+                        'path': partition['name']
+                    }
+                    info['partitions'].append(partition_info)
             
         except Exception as e:
             print(f"Error getting Ventoy info: {e}")
@@ -5,39 +5,103 @@ Image Writer Main Window - Modern PySide6 window with fluent design
 
 import os
 import sys
+from functools import cached_property
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                                QLabel, QPushButton, QProgressBar, QTextEdit, 
                                QGroupBox, QFileDialog, QMessageBox, QComboBox)
-from PySide6.QtCore import Qt, QThread, QTimer, Signal, QSize
+from PySide6.QtCore import Qt, QThread, QThreadPool, QTimer, Signal, QSize
 from PySide6.QtGui import QFont, QPalette, QColor, QIcon
 
 from widgets.modern_button import ModernButton
 from widgets.device_selector import DeviceSelector
 from widgets.progress_widget import ProgressWidget
-from helper.ventoy_manager import VentoyManager
-from helper.usb_detector import USBDetector
-from helper.file_operations import FileOperations
+
+# Fluent design stylesheet, main() installs it on the QApplication together with BUTTON_STYLE
+MODERN_STYLE = """
+    QMainWindow {
+        background-color: #f3f3f3;
+        color: #202020;
+    }
+    
+    QLabel#title {
+        font-size: 24px;
+        font-weight: bold;
+        color: #0078d4;
+        padding: 10px;
+    }
+    
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #e1e1e1;
+        border-radius: 8px;
+        margin-top: 1ex;
+        padding-top: 10px;
+        background-color: white;
+    }
+    
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #0078d4;
+    }
+    
+    QTextEdit {
+        border: 1px solid #e1e1e1;
+        border-radius: 4px;
+        padding: 8px;
+        background-color: white;
+        selection-background-color: #0078d4;
+    }
+    
+    QComboBox {
+        border: 1px solid #e1e1e1;
+        border-radius: 4px;
+        padding: 8px;
+        background-color: white;
+        min-height: 20px;
+    }
+    
+    QComboBox::drop-down {
+        border: none;
+        width: 20px;
+    }
+    
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid #666;
+        margin-right: 5px;
+    }
+    
+    QProgressBar {
+        border: 1px solid #e1e1e1;
+        border-radius: 4px;
+        text-align: center;
+        background-color: #f0f0f0;
+    }
+    
+    QProgressBar::chunk {
+        background-color: #0078d4;
+        border-radius: 3px;
+    }
+"""
 
 class ImageWriterWindow(QMainWindow):
     """Main window for the Image Writer application"""
     
+    udev_event = Signal()
+    
     def __init__(self):
         super().__init__()
         print("Initializing ImageWriterWindow...")
         
         try:
-            print("Creating VentoyManager...")
-            self.ventoy_manager = VentoyManager()
-            
-            print("Creating USBDetector...")
-            self.usb_detector = USBDetector()
-            
-            print("Creating FileOperations...")
-            self.file_ops = FileOperations()
-            
             self.selected_images = []
             self.selected_device = None
             self.active_threads = []
+            self.copy_jobs = []
             
             print("Setting up UI...")
             self.setup_ui()
@@ -45,8 +109,8 @@ class ImageWriterWindow(QMainWindow):
             print("Setting up connections...")
             self.setup_connections()
             
-            print("Refreshing devices...")
-            self.refresh_devices()
+            # Scan for devices once the window has been painted
+            QTimer.singleShot(0, self.start_device_detection)
             
             print("ImageWriterWindow initialized successfully")
         except Exception as e:
@@ -55,15 +119,41 @@ class ImageWriterWindow(QMainWindow):
             traceback.print_exc()
             raise
         
+    @cached_property
+    def ventoy_manager(self):
+        """VentoyManager, created on first use so requests and tarfile load after the window shows"""
+        from helper.ventoy_manager import VentoyManager
+        print("Creating VentoyManager...")
+        return VentoyManager()
+    
+    @cached_property
+    def usb_detector(self):
+        """USBDetector, created on first use"""
+        from helper.usb_detector import USBDetector
+        print("Creating USBDetector...")
+        return USBDetector()
+    
+    @cached_property
+    def file_ops(self):
+        """FileOperations, created on first use"""
+        from helper.file_operations import FileOperations
+        print("Creating FileOperations...")
+        return FileOperations()
+    
+    def start_device_detection(self):
+        """List devices and keep the list current from udev events"""
+        print("Refreshing devices...")
+        self.refresh_devices()
+        
+        # Refresh on hotplug, the observer thread hands events to the GUI thread through a signal
+        self._observer = self.usb_detector.start_observer(self.udev_event.emit)
+        
     def setup_ui(self):
         """Setup the user interface"""
         self.setWindowTitle("Ventoy Image Writer")
         self.setMinimumSize(600, 500)
         self.resize(800, 600)
         
-        # Apply modern styling
-        self.setStyleSheet(self.get_modern_style())
-        
         # Central widget
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -147,7 +237,13 @@ class ImageWriterWindow(QMainWindow):
         """Setup signal connections"""
         self.select_images_btn.clicked.connect(self.select_images)
         self.clear_images_btn.clicked.connect(self.clear_images)
-        self.refresh_devices_btn.clicked.connect(self.refresh_devices)
+        # Clicks and bursts of udev events within 500 ms collapse into one refresh
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self.refresh_devices)
+        self.refresh_devices_btn.clicked.connect(lambda: self.refresh_timer.start())
+        self.udev_event.connect(self.refresh_timer.start)
         self.install_ventoy_btn.clicked.connect(self.install_ventoy)
         self.write_images_btn.clicked.connect(self.write_images)
         self.device_selector.device_selected.connect(self.on_device_selected)
@@ -175,12 +271,10 @@ class ImageWriterWindow(QMainWindow):
     def update_images_display(self):
         """Update the images display text"""
         if not self.selected_images:
-            self.images_text.setText("No images selected...")
+            self.images_text.setPlainText("No images selected...")
         else:
-            text = "Selected Images:\\n"
-            for img in self.selected_images:
-                text += f"• {os.path.basename(img)}\\n"
-            self.images_text.setText(text)
+            lines = [f"• {os.path.basename(img)}" for img in self.selected_images]
+            self.images_text.setPlainText("Selected Images:\n" + "\n".join(lines))
             
     def refresh_devices(self):
         """Refresh the list of USB devices"""
@@ -193,8 +287,21 @@ class ImageWriterWindow(QMainWindow):
         self.install_ventoy_btn.setEnabled(device is not None)
         self.update_write_button_state()
         
-        # Check if device already has Ventoy
-        if device and self.ventoy_manager.has_ventoy(device):
+        # Check if device already has Ventoy without blocking the UI on lsblk
+        if device:
+            self.ventoy_manager.probe_ventoy(
+                device, lambda has_ventoy: self.on_ventoy_probed(device, has_ventoy), self
+            )
+        else:
+            self.progress_widget.set_status("Device selected - Ventoy not detected")
+            
+    def on_ventoy_probed(self, device, has_ventoy):
+        """Show the result of the Ventoy check for the selected device"""
+        if device != self.selected_device:
+            # Another device was selected while lsblk was running
+            return
+            
+        if has_ventoy:
             self.progress_widget.set_status("Ventoy partition detected on device")
         else:
             self.progress_widget.set_status("Device selected - Ventoy not detected")
@@ -220,8 +327,23 @@ class ImageWriterWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             self.progress_widget.start_operation("Installing Ventoy...")
-            self.ventoy_manager.install_ventoy(self.selected_device, self.progress_widget)
+            installer = self.ventoy_manager.install_ventoy(self.selected_device, self.progress_widget)
+            installer.finished.connect(lambda: self.active_threads.remove(installer))
+            installer.finished.connect(self.invalidate_device_caches)
+            self.active_threads.append(installer)
             
+    def on_copy_finished(self, copy_job):
+        """Drop device caches and forget a finished copy job, its signals go last"""
+        self.invalidate_device_caches()
+        self.copy_jobs.remove(copy_job)
+        copy_job.signals.deleteLater()
+        
+    def invalidate_device_caches(self):
+        """Drop cached device scans once an operation may have changed the device"""
+        from helper.usb_detector import invalidate_device_cache
+        invalidate_device_cache()
+        self.ventoy_manager.invalidate_cache()
+        
     def write_images(self):
         """Write selected images to the device"""
         if not self.selected_images or not self.selected_device:
@@ -242,87 +364,26 @@ class ImageWriterWindow(QMainWindow):
             else:
                 return
                 
-        # Start writing images
+        # Start writing images on the global thread pool, progress arrives through signals
+        from helper.file_operations import CopyRunnable
         self.progress_widget.start_operation("Writing images...")
-        self.file_ops.copy_images_to_ventoy(
+        device_info = self.device_selector.get_device(self.selected_device)
+        copy_job = CopyRunnable(
             self.selected_images, 
             self.selected_device, 
-            self.progress_widget
+            self.progress_widget,
+            device_info,
+            self
         )
+        copy_job.signals.progress_updated.connect(self.progress_widget.set_progress)
+        copy_job.signals.status_updated.connect(self.progress_widget.set_status)
+        copy_job.signals.log_updated.connect(self.progress_widget.add_log)
+        copy_job.signals.finished_signal.connect(self.progress_widget.finish_operation)
+        copy_job.signals.finished.connect(lambda: self.on_copy_finished(copy_job))
+        
+        self.copy_jobs.append(copy_job)
+        QThreadPool.globalInstance().start(copy_job)
         
-    def get_modern_style(self):
-        """Get modern fluent design stylesheet"""
-        return """
-        QMainWindow {
-            background-color: #f3f3f3;
-            color: #202020;
-        }
-        
-        QLabel#title {
-            font-size: 24px;
-            font-weight: bold;
-            color: #0078d4;
-            padding: 10px;
-        }
-        
-        QGroupBox {
-            font-weight: bold;
-            border: 2px solid #e1e1e1;
-            border-radius: 8px;
-            margin-top: 1ex;
-            padding-top: 10px;
-            background-color: white;
-        }
-        
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-            color: #0078d4;
-        }
-        
-        QTextEdit {
-            border: 1px solid #e1e1e1;
-            border-radius: 4px;
-            padding: 8px;
-            background-color: white;
-            selection-background-color: #0078d4;
-        }
-        
-        QComboBox {
-            border: 1px solid #e1e1e1;
-            border-radius: 4px;
-            padding: 8px;
-            background-color: white;
-            min-height: 20px;
-        }
-        
-        QComboBox::drop-down {
-            border: none;
-            width: 20px;
-        }
-        
-        QComboBox::down-arrow {
-            image: none;
-            border-left: 5px solid transparent;
-            border-right: 5px solid transparent;
-            border-top: 5px solid #666;
-            margin-right: 5px;
-        }
-        
-        QProgressBar {
-            border: 1px solid #e1e1e1;
-            border-radius: 4px;
-            text-align: center;
-            background-color: #f0f0f0;
-        }
-        
-        QProgressBar::chunk {
-            background-color: #0078d4;
-            border-radius: 3px;
-        }
-        """
-    
     def closeEvent(self, event):
         """Handle window close event"""
         print("Closing application...")
@@ -334,21 +395,24 @@ class ImageWriterWindow(QMainWindow):
         try:
             print("Cleaning up resources...")
             
-            # Stop any active threads
+            # Stop listening for udev events before the window goes away
+            if getattr(self, '_observer', None) is not None:
+                self._observer.stop()
+                
+            # Ask workers to stop at their next safe point and wait for them, killing them could leave the device mounted
+            for copy_job in self.copy_jobs:
+                copy_job.cancel()
             for thread in self.active_threads:
-                if thread.isRunning():
-                    print(f"Stopping thread: {thread}")
-                    thread.quit()
-                    thread.wait(1000)  # Wait up to 1 second
-                    if thread.isRunning():
-                        thread.terminate()
-                        thread.wait(1000)
-            
-            # Clean up managers
-            if hasattr(self, 'ventoy_manager'):
-                self.ventoy_manager.cleanup()
+                thread.cancel()
                 
-            if hasattr(self, 'file_ops'):
+            QThreadPool.globalInstance().waitForDone()
+            for thread in self.active_threads:
+                if thread.isRunning():
+                    print(f"Waiting for thread: {thread}")
+                    thread.wait()
+                    
+            # Clean up managers that were created, downloaded Ventoy releases stay cached for the next install
+            if 'file_ops' in self.__dict__:
                 self.file_ops.cleanup()
                 
             print("Cleanup completed")
@@ -8,7 +8,6 @@ import os
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
-from image_writer import ImageWriterWindow
 
 def main():
     """Main entry point for the application"""
@@ -19,6 +18,13 @@ def main():
     app.setApplicationVersion("1.0.0")
     app.setOrganizationName("VentoyImageWriter")
     
+    # The window and its helpers are imported once the application exists
+    from image_writer import ImageWriterWindow, MODERN_STYLE
+    from widgets.modern_button import BUTTON_STYLE
+    
+    # One application-wide stylesheet is parsed once instead of per widget
+    app.setStyleSheet(MODERN_STYLE + BUTTON_STYLE)
+    
     # High DPI support is enabled by default in Qt 6
     
     try:
@@ -7,6 +7,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from PySide6.QtCore import QCoreApplication
 from helper.ventoy_manager import VentoyManager
 
 class MockProgressWidget:
@@ -38,15 +39,19 @@ def test_ventoy_installation():
     print("Testing Ventoy Installation with Auto-confirmation")
     print("=" * 60)
     
-    # Check if we have USB devices
-    import subprocess
+    # Check if we have USB devices, sysfs shows the bus in each disk's device link
     try:
-        result = subprocess.run(['lsblk', '-d', '-o', 'NAME,SIZE,TYPE,TRAN'], 
-                               capture_output=True, text=True, check=True)
         print("Available USB devices:")
-        for line in result.stdout.split('\n'):
-            if 'usb' in line:
-                print(f"  {line}")
+        for name in sorted(os.listdir('/sys/block')):
+            path = f'/sys/block/{name}'
+            try:
+                if '/usb' not in os.path.realpath(os.path.join(path, 'device')):
+                    continue
+                with open(f'{path}/size') as f:
+                    size = int(f.read()) * 512
+            except (OSError, ValueError):
+                continue
+            print(f"  /dev/{name}  {size / (1 << 30):.1f}G")
         
         # Use /dev/sdc for testing (if available)
         device = "/dev/sdc"
@@ -59,6 +64,9 @@ def test_ventoy_installation():
             print("Test cancelled by user")
             return
         
+        # Signals from the installer thread are delivered through the event loop
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        
         # Create mock progress widget
         progress_widget = MockProgressWidget()
         
@@ -66,7 +74,9 @@ def test_ventoy_installation():
         ventoy_manager = VentoyManager()
         
         print("\nStarting Ventoy installation test...")
-        ventoy_manager.install_ventoy(device, progress_widget)
+        installer = ventoy_manager.install_ventoy(device, progress_widget)
+        installer.finished.connect(app.quit)
+        app.exec()
         
         print("\nTest completed!")
         
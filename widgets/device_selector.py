@@ -14,6 +14,7 @@ class DeviceSelector(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.devices = []
+        self._by_path = {}
         self.setup_ui()
         
     def setup_ui(self):
@@ -41,21 +42,43 @@ class DeviceSelector(QWidget):
         
     def update_devices(self, devices):
         """Update the list of available devices"""
+        previous = self.get_selected_device()
         self.devices = devices
+        self._by_path = {device['path']: device for device in devices}
+        
+        # Fill the combo box in one go, it only relayouts and signals once at the end
+        self.device_combo.setUpdatesEnabled(False)
+        self.device_combo.blockSignals(True)
         self.device_combo.clear()
         
         if not devices:
             self.device_combo.addItem("No USB devices found")
+            # With a placeholder text the combo stays at -1, select the item so currentText names it
+            self.device_combo.setCurrentIndex(0)
             self.device_combo.setEnabled(False)
-            self.device_info_label.setText("No USB devices detected")
         else:
             self.device_combo.setEnabled(True)
-            self.device_combo.addItem("Select a USB device...")
-            
-            for device in devices:
-                display_text = f"{device['path']} - {device['size']} ({device['model']})"
-                self.device_combo.addItem(display_text, device['path'])
+            self.device_combo.addItems(["Select a USB device..."] + [
+                f"{device['path']} - {device['size']} ({device['model']})" for device in devices
+            ])
+            for index, device in enumerate(devices, 1):
+                self.device_combo.setItemData(index, device['path'])
                 
+            # Keep the selection when the device is still plugged in
+            index = self.device_combo.findData(previous) if previous else -1
+            self.device_combo.setCurrentIndex(max(index, 0))
+            
+        self.device_combo.blockSignals(False)
+        self.device_combo.setUpdatesEnabled(True)
+        
+        # Only announce a selection change, refreshes during an operation must not reset its status.
+        # An empty list always deselects, the window may still hold a device that was unplugged
+        if not devices or self.get_selected_device() != previous:
+            self.on_device_changed(self.device_combo.currentText())
+        
+        if not devices:
+            self.device_info_label.setText("No USB devices detected")
+        elif self.device_combo.currentIndex() == 0:
             self.device_info_label.setText(f"Found {len(devices)} USB device(s)")
             
     def on_device_changed(self, text):
@@ -73,12 +96,15 @@ class DeviceSelector(QWidget):
                 self.device_selected.emit(device_path)
                 
                 # Find device info
-                for device in self.devices:
-                    if device['path'] == device_path:
-                        info_text = f"Selected: {device['path']} - {device['size']} GB"
-                        self.device_info_label.setText(info_text)
-                        break
-                        
+                device = self._by_path.get(device_path)
+                if device:
+                    info_text = f"Selected: {device['path']} - {device['size']} GB"
+                    self.device_info_label.setText(info_text)
+                    
+    def get_device(self, device_path):
+        """Get the info dict of a listed device, None when it is not listed"""
+        return self._by_path.get(device_path)
+        
     def get_selected_device(self):
         """Get the currently selected device path"""
         current_index = self.device_combo.currentIndex()
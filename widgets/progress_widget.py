@@ -5,6 +5,7 @@ Progress Widget - Shows operation progress and status
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QTextEdit
 from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtGui import QTextCursor
 
 class ProgressWidget(QWidget):
     """Widget for displaying operation progress"""
@@ -13,6 +14,20 @@ class ProgressWidget(QWidget):
         super().__init__(parent)
         self.setup_ui()
         
+        # Log lines arriving within 50 ms are appended to the log area together
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.timeout.connect(self._flush_logs)
+        
+        # Only the latest progress value is shown, at most about 30 times a second
+        self._pending_progress = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(33)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.timeout.connect(self._flush_progress)
+        
     def setup_ui(self):
         """Setup the user interface"""
         layout = QVBoxLayout(self)
@@ -54,29 +69,53 @@ class ProgressWidget(QWidget):
         """Start an operation"""
         self.status_label.setText(f"Running: {operation_name}")
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        self._set_progress_now(0)
         self.log_area.setVisible(True)
+        self._log_buf.clear()
         self.log_area.clear()
         self.add_log(f"Started: {operation_name}")
         
     def set_progress(self, value):
         """Set progress value (0-100)"""
+        self._pending_progress = value
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+            
+    def _flush_progress(self):
+        """Show the latest progress value"""
+        if self._pending_progress is not None:
+            self.progress_bar.setValue(self._pending_progress)
+            self._pending_progress = None
+            
+    def _set_progress_now(self, value):
+        """Show value immediately and drop any throttled update"""
+        self._progress_timer.stop()
+        self._pending_progress = None
         self.progress_bar.setValue(value)
         
     def add_log(self, message):
         """Add a log message"""
-        self.log_area.append(message)
+        self._log_buf.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+            
+    def _flush_logs(self):
+        """Append the buffered log messages in one block"""
+        if not self._log_buf:
+            return
+            
+        self.log_area.append('\n'.join(self._log_buf))
+        self._log_buf.clear()
         # Auto-scroll to bottom
-        cursor = self.log_area.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.log_area.setTextCursor(cursor)
+        self.log_area.moveCursor(QTextCursor.MoveOperation.End)
+        self.log_area.ensureCursorVisible()
         
     def finish_operation(self, success=True, message=""):
         """Finish the current operation"""
         if success:
             self.status_label.setText("Operation completed successfully")
             self.status_label.setStyleSheet("font-weight: bold; color: #107c10;")
-            self.progress_bar.setValue(100)
+            self._set_progress_now(100)
             if message:
                 self.add_log(f"Success: {message}")
         else:
@@ -99,4 +138,5 @@ class ProgressWidget(QWidget):
         self.status_label.setStyleSheet("font-weight: bold; color: #0078d4;")
         self.progress_bar.setVisible(False)
         self.log_area.setVisible(False)
+        self._log_buf.clear()
         self.log_area.clear()